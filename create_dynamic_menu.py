@@ -7,28 +7,44 @@ to previous menus and exiting the program.
 """
 from typing import List, Dict, Any, Tuple, Callable, Optional, Union
 from helpers import exit_program, encased_print
+import sys
 
+_BACK_CMDS = frozenset(map(sys.intern, ('back', 'b')))
+_EXIT_CMDS = frozenset(map(sys.intern, ('quit', 'q', 'exit', 'e')))
 
-def display_menu(menu_options: List[Tuple[int, Tuple[Callable[..., Any], str, Tuple[Any, ...], Dict[str, Any]]]]) -> None:
+
+def format_menu(menu_options: Dict[int, Tuple[Callable[..., Any], str, Tuple[Any, ...], Dict[str, Any]]]) -> str:
     """
-    Prints a list of numbered menu options to the console.
+    Builds the text of a numbered menu from its options.
 
-    Displays each option's number and description, followed by a prompt
+    Lists each option's number and description, followed by a prompt
     indicating how to return to a previous menu.
 
     Parameters:
-        menu_options (List[Tuple[int, Tuple[Callable[..., Any], str, Tuple[Any, ...], Dict[str, Any]]]]):
-            List of menu entries. Each entry consists of:
-                - Position number (int)
-                - Tuple containing:
-                    (callable, description text, positional args tuple, keyword args dict)
+        menu_options (Dict[int, Tuple[Callable[..., Any], str, Tuple[Any, ...], Dict[str, Any]]]):
+            Menu entries keyed by position number (int). Each value is a tuple containing:
+                (callable, description text, positional args tuple, keyword args dict)
+
+    Returns:
+        str: The complete menu text, ready to be written to the console.
     """
-    for position, (_, description, _, _) in menu_options:
-        print(f'Enter {position} to {description}.')
-    print('Enter "back" or "b" to navigate back')
+    return (
+        '\n'.join(f'Enter {position} to {description}.' for position, (_, description, _, _) in menu_options.items())
+        + '\nEnter "back" or "b" to navigate back\n'
+    )
 
 
-def get_user_choice(valid_positions: List[int]) -> int | str:
+def display_menu(menu_display: str) -> None:
+    """
+    Prints a prebuilt menu text to the console.
+
+    Parameters:
+        menu_display (str): Menu text as returned by `format_menu`.
+    """
+    sys.stdout.write(menu_display)
+
+
+def get_user_choice(valid_positions: frozenset[int]) -> int | str:
     """
     Prompts the user to select a menu option and validates the input.
 
@@ -37,47 +53,43 @@ def get_user_choice(valid_positions: List[int]) -> int | str:
         - 'quit', 'q', 'exit', or 'e' to terminate the program.
 
     Parameters:
-        valid_positions (List[int]): List of valid numeric menu choices.
+        valid_positions (frozenset[int]): Set of valid numeric menu choices.
 
     Returns:
         int | str: The selected menu position as an integer, or a string command.
     """
     while True:
-        user_input = input("\nEnter your choice: ").strip().lower()    
-        if user_input in {'back', 'b'}:
+        user_input = sys.intern(input("\nEnter your choice: ").strip().lower())
+        if user_input in _BACK_CMDS:
             return user_input
-        elif user_input in {'quit', 'q', 'exit', 'e'}:
+        if user_input in _EXIT_CMDS:
             exit_program()
-        try:
+        if user_input.removeprefix('-').isdecimal():
             choice = int(user_input)
             if choice in valid_positions:
                 return choice
-            else:
-                raise ValueError
-        except ValueError:
-            encased_print('Invalid input. Please enter a valid number or command.')
+        encased_print('Invalid input. Please enter a valid number or command.')
         
  
-def execute_menu_action(choice: int, menu_options: List[Tuple[int, Tuple[Callable[..., Any], str, Tuple[Any, ...], Dict[str, Any]]]]) -> Any:
+def execute_menu_action(choice: int, menu_options: Dict[int, Tuple[Callable[..., Any], str, Tuple[Any, ...], Dict[str, Any]]]) -> Any:
     """
     Executes the function associated with the chosen menu position.
 
-    Searches the provided menu options for the given choice and calls
+    Looks up the given choice in the provided menu options and calls
     the corresponding function with its stored arguments.
 
     Parameters:
         choice (int): Menu position to execute.
-        menu_options (List[Tuple[int, Tuple[Callable[..., Any], str, Tuple[Any, ...], Dict[str, Any]]]]):
-            List of menu entries with callable functions and their arguments.
+        menu_options (Dict[int, Tuple[Callable[..., Any], str, Tuple[Any, ...], Dict[str, Any]]]):
+            Menu entries keyed by position, holding callable functions and their arguments.
 
     Returns:
         Any: The return value from the executed function.
     """
     print()
-    for position, (function, _, args, kwargs) in menu_options:
-        if choice == position:
-            return function(*args, **kwargs)
-        
+    function, _, args, kwargs = menu_options[choice]
+    return function(*args, **kwargs)
+
     
 def create_dynamic_menu(labeled_funcs: List[Tuple[Callable[..., Any], str, Tuple[Any, ...], Dict[str, Any]]]) -> Any: 
     """
@@ -94,14 +106,18 @@ def create_dynamic_menu(labeled_funcs: List[Tuple[Callable[..., Any], str, Tuple
     Returns:
         Any: The result from the executed menu function.
     """
-    menu_options = [(0, (exit_program, 'exit', (), {}))]
-    menu_options.extend(enumerate(labeled_funcs, start=1))
-    valid_positions = [position[0] for position in menu_options]
+    menu_options = {0: (exit_program, 'exit', (), {})}
+    menu_options.update(
+        (position, (function, sys.intern(description), args, kwargs))
+        for position, (function, description, args, kwargs) in enumerate(labeled_funcs, start=1)
+    )
+    menu_display = format_menu(menu_options)
+    valid_positions = frozenset(menu_options)
     
     while True:
-        display_menu(menu_options)
+        display_menu(menu_display)
         choice = get_user_choice(valid_positions)
-        if choice in {'back', 'b'}:
+        if choice in _BACK_CMDS:
             break
         result = execute_menu_action(choice, menu_options)
         return result
\ No newline at end of file
@@ -2,7 +2,7 @@
 Colection of small functions to help handle simple things
 """
 from typing import List, Dict, Any, Tuple, Callable, Optional, Union
-from functools import wraps
+from functools import wraps, lru_cache
 import sys
 
 
@@ -24,6 +24,14 @@ def exit_program(*, reason: str | None = None) -> None:
     sys.exit()
     
     
+@lru_cache(maxsize=16)
+def _border(symbol: str, length: int) -> str:
+    """
+    Returns a border line made of the given symbol, cached per (symbol, length) pair.
+    """
+    return symbol * length
+
+
 def encased_print(*args: Any, symbol: str = '-', length: int = 70) -> None:
     """
     Prints text enclosed within a repeated symbol border.
@@ -36,11 +44,9 @@ def encased_print(*args: Any, symbol: str = '-', length: int = 70) -> None:
         symbol (str): Character to use for the border (default '-').
         length (int): Number of symbols to repeat for the border (default 70).
     """
-    print(symbol * length)
+    border = _border(symbol, length)
     if not args:
-        print()
+        sys.stdout.write(border + '\n\n')
         return
-    for arg in args:
-        print(arg)
-    print(symbol * length)
+    sys.stdout.write('\n'.join([border, *map(str, args), border]) + '\n')
     
\ No newline at end of file
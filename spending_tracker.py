@@ -1,40 +1,44 @@
-from typing import List, Dict, Any, Tuple, Callable, Optional, Union
+from typing import List, Dict, Set, Any, Tuple, Callable, Optional, Union
 from functools import wraps
 from datetime import datetime
 from helpers import exit_program, encased_print
 from create_dynamic_menu import create_dynamic_menu as menu
+import glob
 import json
+import math
+import os
 import re
 import time
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # -------------------------------------
 # |-- Constants & global Variables  --|
 # -------------------------------------
 APP_NAME = 'Spending Tracker'
-USER_DATA_PATH = 'user_data.json'
+USER_DATA_PATH = 'users'
+LEGACY_USER_DATA_PATH = 'user_data.json'
+PURCHASE_LOG_PATH = 'purchases.jsonl'
 RESERVED_USERNAMES = {'admin', 'root', 'guest'}
 COMMON_PASSWORDS_PATH = '100k-most-used-passwords-NCSC.txt'
-COMMON_PASSWORDS = set()
+_COMMON_PASSWORDS: Optional[frozenset] = None
+
+_USERNAME_RE = re.compile(r'[a-z0-9_-]{3,14}')
+_EMAIL_RE = re.compile(r'[^@ \t\r\n]+@[^@ \t\r\n]+\.[^@ \t\r\n]+')
+_PHONE_RE = re.compile(r'\+\d{8,15}')
+_DATE_RE = re.compile(r'(\d{1,2})([-/])(\d{1,2})\2(\d{4})')
+_UPPER_RE = re.compile(r'[A-Z]')
+_LOWER_RE = re.compile(r'[a-z]')
+_DIGIT_RE = re.compile(r'\d')
+_SPECIAL = frozenset('!@#$%^&*')
+_PURCHASE_KEYS = frozenset({'date', 'seller', 'item_name', 'cost', 'quantity', 'total_weight', 'total_cost'})
 
 current_user: Dict[str, Any] = None
 is_logged_in: bool = False
-
-
-# ----------------------
-# |-- Initialization --|
-# ----------------------
-try:
-    with open(COMMON_PASSWORDS_PATH, 'r', encoding='utf-8') as f:
-        for line in f:
-            COMMON_PASSWORDS.add(line.strip())
-except FileNotFoundError:
-    print(f'Error: The file "{COMMON_PASSWORDS_PATH}" was not found.')
-except PermissionError:
-    print(f'Error: Permission denied to read the file "{COMMON_PASSWORDS_PATH}".')
-except IOError as e:
-    print(f'Error: An I/O error occurred while reading "{COMMON_PASSWORDS_PATH}": {e}')
-except Exception as e:
-    print(f'An unexpected error occurred while trying to read data from "{COMMON_PASSWORDS_PATH}": {e}')
+_user_purchase_keys: Dict[str, Set[Tuple[Any, ...]]] = {}
 
 
 # ------------------
@@ -48,13 +52,14 @@ def encase_output(symbol: str = '-', length: int = 70) -> Callable[[Callable[...
         symbol (str): The character used for the separator.
         length (int): The length of the separator line.
     """
+    separator = symbol * length # built once when the decorator is applied
     # for decorators that can accept arguments, we need a seccond decoratpor
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            print(symbol * length)
+            print(separator)
             function = func(*args, **kwargs)
-            print(symbol * length)
+            print(separator)
             return function
         return wrapper
     return decorator
@@ -86,55 +91,303 @@ def requires_login(func: Callable[..., Any]) -> Callable[..., Any]:
 # |-- Functions --|
 # -----------------
 
-def load_user_data(*, data_path: str = USER_DATA_PATH) -> List[Dict[str, Any]]:
+def json_dumps(data: Any, *, indent: bool = False) -> bytes:
+    """
+    Serializes data to UTF-8 encoded JSON, using orjson if it is installed.
+
+    Parameters:
+        data (Any): The data to serialize.
+        indent (bool): Whether to indent the output by two spaces.
+
+    Returns:
+        bytes: The serialized JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(data, indent=2).encode('utf-8')
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def json_loads(data: bytes) -> Any:
+    """
+    Deserializes UTF-8 encoded JSON, using orjson if it is installed.
+
+    Parameters:
+        data (bytes): The JSON to deserialize.
+
+    Returns:
+        Any: The deserialized data.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def user_data_file(username: str, *, data_path: str = USER_DATA_PATH) -> str:
+    """
+    Returns the path of the json file holding a single user's data.
+
+    Parameters:
+        username (str): The user's username.
+        data_path (str): The directory holding the user data files.
+
+    Returns:
+        str: The path of the user's data file.
+    """
+    return os.path.join(data_path, f'{username}.json')
+
+
+def migrate_legacy_user_data(
+    *, legacy_path: str = LEGACY_USER_DATA_PATH, data_path: str = USER_DATA_PATH
+) -> bool:
+    """
+    Splits the user list of the old single-file format into one file per user.
+
+    The files are written into a temporary directory that is only renamed to data_path once
+    every user was saved, so an interrupted migration is simply repeated on the next start.
+    The old file is left in place.
+
+    Parameters:
+        legacy_path (str): Path of the old json file holding the list of all users.
+        data_path (str): The directory to create the user data files in.
+
+    Returns:
+        bool: True if all users were migrated, False otherwise.
+    """
+    temp_path = f'{data_path}.tmp'
+    try:
+        with open(legacy_path, 'rb') as f:
+            users = json_loads(f.read())
+        for user in users:
+            if not save_single_user(user, indent=True, quiet=True, data_path=temp_path):
+                return False
+        os.makedirs(temp_path, exist_ok=True)
+        os.replace(temp_path, data_path)
+        encased_print(
+            f'Moved the user data from "{legacy_path}" into the directory "{data_path}".',
+            f'"{legacy_path}" is no longer used and can be deleted.'
+        )
+        return True
+    except PermissionError as e:
+        print(f'Error: Permission denied while moving the user data from "{legacy_path}" to "{data_path}".')
+    except IOError as e:
+        print(f'Error: An I/O error occurred while moving the user data from "{legacy_path}" to "{data_path}": {e}')
+    except json.JSONDecodeError as e:
+        print(f'Error: Could not decode JSON from "{legacy_path}". The file might be corrupted or not valid JSON.')
+    except Exception as e:
+        print(f'An unexpected error occurred while trying to move the user data from "{legacy_path}": {e}')
+    return False
+
+
+def load_user_data(
+    *, data_path: str = USER_DATA_PATH
+) -> Optional[Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]]:
     """"
-    Load and return user data from a json file, expecting a list of dictionaries inside.
+    Load and return user data from a directory of json files, expecting one user dictionary per file.
+    If the directory does not exist yet, it is created from the old single-file format if present, or empty otherwise.
+    The username and email indexes are built in the same pass over the loaded users.
     
     Parameters:
         data_path (str)
     
     Returns:
-        user_data (List[Dict[str, Any]])
+        user_data (List[Dict[str, Any]]), users_by_username (Dict[str, Dict[str, Any]]),
+        users_by_email (Dict[str, Dict[str, Any]])
     
     """
+    if not os.path.isdir(data_path) and os.path.exists(LEGACY_USER_DATA_PATH):
+        if not migrate_legacy_user_data(data_path=data_path):
+            return None
+    user_file = data_path
     try:    
-        with open(data_path, 'r') as f:
-            users = json.load(f)
-        return users
+        os.makedirs(data_path, exist_ok=True)
+        users = []
+        users_by_username = {}
+        users_by_email = {}
+        for user_file in sorted(glob.glob(os.path.join(data_path, '*.json'))):
+            with open(user_file, 'rb') as f:
+                user = json_loads(f.read())
+            users.append(user)
+            users_by_username[user['username']] = user
+            users_by_email[user['email']] = user
     except PermissionError as e:
-        print('Error: Permission denied to read the file.')
-    except FileNotFoundError as e:
-        print(f'Error: The file {data_path} does not exist.')
+        print(f'Error: Permission denied to read the file "{user_file}".')
     except IOError as e:
-        print(f'Error: An I/O error occurred while reading "{data_path}": {e}')
+        print(f'Error: An I/O error occurred while reading "{user_file}": {e}')
     except json.JSONDecodeError as e:
-        print(f'Error: Could not decode JSON from "{data_path}". The file might be corrupted or not valid JSON.')
+        print(f'Error: Could not decode JSON from "{user_file}". The file might be corrupted or not valid JSON.')
     except Exception as e:
-        print(f'An unexpected error occurred while trying to read data from "{data_path}": {e}')
+        print(f'An unexpected error occurred while trying to read data from "{user_file}": {e}')
+    else:
+        replay_purchase_log(users_by_username)
+        return users, users_by_username, users_by_email
     
   
-def save_user_data(users: List[Dict[str, Any]]) -> None:
+def save_single_user(
+    user: Dict[str, Any], *, indent: bool = False, quiet: bool = False, data_path: str = USER_DATA_PATH
+) -> bool:
     """
-    Writes the entire list of user records to disk in JSON format.
+    Writes a single user record to its own file in JSON format, leaving all other users' files untouched.
 
+    The JSON is written compactly unless indent is set, as it is only read back by the program.
+    The data is written to a temporary file first and then moved over the user's file,
+    so an interrupted save never leaves a partially written user file behind.
     Handles file I/O and JSON serialization errors gracefully, printing appropriate messages.
 
     Parameters:
-        users (List[Dict[str, Any]]): The complete list of user data to be saved.
+        user (Dict[str, Any]): The user data to be saved.
+        indent (bool): Whether to indent the JSON for human inspection.
+        quiet (bool): Whether to skip the success message. Errors are always printed.
+        data_path (str): The directory holding the user data files.
+
+    Returns:
+        bool: True if the user data was written successfully, False otherwise.
     """
+    user_file = user_data_file(user['username'], data_path=data_path)
+    temp_file = f'{user_file}.tmp'
     try:
-        with open(USER_DATA_PATH, 'w') as f:
-            json.dump(users, f, indent=2)
-        encased_print(f'Successfully saved new data to file {USER_DATA_PATH}!')
+        os.makedirs(data_path, exist_ok=True)
+        with open(temp_file, 'wb') as f:
+            f.write(json_dumps(user, indent=indent))
+        os.replace(temp_file, user_file)
+        if not quiet:
+            encased_print(f'Successfully saved new data to file {user_file}!')
+        return True
     except IOError as e:
-        print(f'Error writing to file "{USER_DATA_PATH}": {e}')
+        print(f'Error writing to file "{user_file}": {e}')
     except TypeError as e:
         print(f'Error serializing data to JSON: {e}')
     except Exception as e:
         print(f'An unexpected error occurred while trying to save user data: {e}')
+    if os.path.exists(temp_file):
+        os.remove(temp_file)
+    return False
+
+
+def append_purchase_log(username: str, purchase_data: Dict[str, Any]) -> bool:
+    """
+    Appends a single purchase to the purchase log instead of rewriting the user's data file.
+
+    Parameters:
+        username (str): The user the purchase belongs to.
+        purchase_data (Dict[str, Any]): The purchase information to store.
+
+    Returns:
+        bool: True if the purchase was written to the log, False otherwise.
+    """
+    try:
+        with open(PURCHASE_LOG_PATH, 'a+b', buffering=1 << 16) as f:
+            # a crash during an earlier append can leave a torn line without a newline behind,
+            # which would otherwise swallow this entry as well
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+            f.write(json_dumps({'user': username, 'purchase': purchase_data}) + b'\n')
+        return True
+    except IOError as e:
+        print(f'Error writing to file "{PURCHASE_LOG_PATH}": {e}')
+    except TypeError as e:
+        print(f'Error serializing data to JSON: {e}')
+    except Exception as e:
+        print(f'An unexpected error occurred while trying to save the purchase: {e}')
+    return False
+
+
+def read_purchase_log(*, log_path: str = PURCHASE_LOG_PATH) -> Optional[List[Dict[str, Any]]]:
+    """
+    Reads all entries from the purchase log.
+
+    Lines that cannot be decoded, such as a line torn by a crash during an append, are skipped with a warning.
+
+    Parameters:
+        log_path (str): Path of the purchase log.
+
+    Returns:
+        Optional[List[Dict[str, Any]]]: The log entries, an empty list if there is no log,
+            or None if the log could not be read.
+    """
+    if not os.path.exists(log_path):
+        return []
+    entries = []
+    try:
+        with open(log_path, 'rb') as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json_loads(line)
+                except ValueError:
+                    entry = None
+                if not isinstance(entry, dict) or 'user' not in entry or 'purchase' not in entry:
+                    print(f'Warning: Skipping unreadable line {line_number} in "{log_path}".')
+                    continue
+                entries.append(entry)
+    except PermissionError:
+        print(f'Error: Permission denied to read the file "{log_path}".')
+        return None
+    except IOError as e:
+        print(f'Error: An I/O error occurred while reading "{log_path}": {e}')
+        return None
+    return entries
+
+
+def replay_purchase_log(users_by_username: Dict[str, Dict[str, Any]], *, log_path: str = PURCHASE_LOG_PATH) -> None:
+    """
+    Applies purchases from the purchase log that are not yet part of the loaded user data.
+
+    Purchases already present for a user are skipped, so a log left behind by an
+    interrupted compaction is not applied twice.
+
+    Parameters:
+        users_by_username (Dict[str, Dict[str, Any]]): The loaded user data, indexed by username.
+        log_path (str): Path of the purchase log.
+    """
+    for entry in read_purchase_log(log_path=log_path) or []:
+        user = users_by_username.get(entry['user'])
+        if user is None:
+            continue
+        purchase_keys = get_user_purchase_keys(user)
+        key = purchase_key(entry['purchase'])
+        if key not in purchase_keys:
+            user['purchases'].append(entry['purchase'])
+            purchase_keys.add(key)
+
+
+def compact(users_by_username: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Folds the purchase log into the data files of the users it mentions, written as indented JSON,
+    and truncates the log.
+
+    Does nothing if the log is missing or empty. The log is only truncated if every user file was saved,
+    otherwise it is kept so the purchases are replayed on the next start. Runs without success messages,
+    as it is called while the program is already shutting down.
+
+    Parameters:
+        users_by_username (Dict[str, Dict[str, Any]]): The user data including logged purchases, indexed by username.
+    """
+    if not os.path.exists(PURCHASE_LOG_PATH) or not os.path.getsize(PURCHASE_LOG_PATH):
+        return
+    entries = read_purchase_log()
+    if entries is None:
+        return
+    usernames = {entry['user'] for entry in entries}
+    saved_all = True
+    for username in usernames:
+        user = users_by_username.get(username)
+        if user is not None and not save_single_user(user, indent=True, quiet=True):
+            saved_all = False
+    if not saved_all:
+        print(f'Not all purchases could be saved, keeping them in "{PURCHASE_LOG_PATH}".')
+        return
+    try:
+        open(PURCHASE_LOG_PATH, 'w').close()
+    except IOError as e:
+        print(f'Error truncating file "{PURCHASE_LOG_PATH}": {e}')
         
         
-def is_valid_new_username(username: str, users: List[Dict[str, Any]]) -> bool: 
+def is_valid_new_username(username: str, users_by_username: Dict[str, Dict[str, Any]]) -> bool: 
     """
     Check if a given username is valid and not already in use.
 
@@ -142,16 +395,16 @@ def is_valid_new_username(username: str, users: List[Dict[str, Any]]) -> bool:
     - Contains only lowercase letters, digits, hyphens, or underscores
     - Is between 3 and 14 characters long
     - Is not in the reserved usernames list
-    - Does not already exist in the provided users list
+    - Does not already exist in the provided username index
 
     Parameters:
         username (str): The username to check.
-        users (List[Dict[str, Any]]): This is the user data
+        users_by_username (Dict[str, Dict[str, Any]]): The user data, indexed by username
 
     Returns:
         bool: True if the username is valid and unused, False otherwise.
     """
-    if not re.fullmatch(r'^[a-z0-9_-]{3,14}$', username):
+    if not _USERNAME_RE.fullmatch(username):
         encased_print(
             f'"{username}" is not a valid username!',
             'Username must be 4-14 characters long and contain only lowercase letters, digits, hyphens (-), or underscores (_).',
@@ -161,14 +414,40 @@ def is_valid_new_username(username: str, users: List[Dict[str, Any]]) -> bool:
     elif username in RESERVED_USERNAMES:
         encased_print(f'Username "{username}" already exists! Please try again.')
         return False
-    else:
-        for user in users:
-            if user['username'] == username:
-                encased_print(f'Username "{username}" already exists! Please try again.')
-                return False
+    elif username in users_by_username:
+        encased_print(f'Username "{username}" already exists! Please try again.')
+        return False
     return True
     
     
+def _get_common_passwords() -> frozenset:
+    """
+    Returns the set of common passwords, loading it from disk on first use.
+
+    The file is read in one go. If it cannot be read, an error is printed
+    once and an empty set is used from then on.
+
+    Returns:
+        frozenset: The most commonly used passwords.
+    """
+    global _COMMON_PASSWORDS
+    if _COMMON_PASSWORDS is not None:
+        return _COMMON_PASSWORDS
+    _COMMON_PASSWORDS = frozenset()
+    try:
+        with open(COMMON_PASSWORDS_PATH, 'r', encoding='utf-8') as f:
+            _COMMON_PASSWORDS = frozenset(f.read().splitlines())
+    except FileNotFoundError:
+        print(f'Error: The file "{COMMON_PASSWORDS_PATH}" was not found.')
+    except PermissionError:
+        print(f'Error: Permission denied to read the file "{COMMON_PASSWORDS_PATH}".')
+    except IOError as e:
+        print(f'Error: An I/O error occurred while reading "{COMMON_PASSWORDS_PATH}": {e}')
+    except Exception as e:
+        print(f'An unexpected error occurred while trying to read data from "{COMMON_PASSWORDS_PATH}": {e}')
+    return _COMMON_PASSWORDS
+
+
 def is_valid_password(password: str) -> bool:
     """
     Validate a password against a set of security rules.
@@ -185,25 +464,20 @@ def is_valid_password(password: str) -> bool:
     Returns:
         bool: True if the password meets all criteria, False otherwise.
     """
-    pattern_upper = r'[A-Z]'
-    pattern_lower = r'[a-z]'
-    pattern_digit = r'\d'
-    pattern_special = r'[!@#$%^&*]'
-    pattern_space = r' '
     reasons = []
-    if password in COMMON_PASSWORDS:
+    if password in _get_common_passwords():
         reasons.append('not be too common')
-    if re.search(pattern_space, password):
+    if ' ' in password:
         reasons.append('not contain empty spaces')
     if not (8 <= len(password) <= 20):
         reasons.append('be between 8 and 20 characters long')
-    if not re.search(pattern_upper, password):
+    if not _UPPER_RE.search(password):
         reasons.append('contain at least one uppercase letter')
-    if not re.search(pattern_lower, password):
+    if not _LOWER_RE.search(password):
         reasons.append('contain at least one lowercase letter')
-    if not re.search(pattern_digit, password):
+    if not _DIGIT_RE.search(password):
         reasons.append('contain at least one digit')
-    if not re.search(pattern_special, password):
+    if _SPECIAL.isdisjoint(password):
         reasons.append('contain at least one special character')
     if not reasons:
         return True
@@ -211,25 +485,25 @@ def is_valid_password(password: str) -> bool:
     return False
 
 
-def is_valid_email(email: str, users: List[Dict[str, Any]]) -> bool:  
+def is_valid_email(email: str, users_by_email: Dict[str, Dict[str, Any]]) -> bool:  
     """
     Validate an email address for correct format and uniqueness.
 
     An email is considered valid if:
     - It matches a basic pattern (text@text.domain)
-    - It is not already used by an existing user in the given list
+    - It is not already used by an existing user in the given index
 
     Parameters:
         email (str): The email address to validate.
-        users (List[Dict[str, Any]]): List of existing users with an 'email' field.
+        users_by_email (Dict[str, Dict[str, Any]]): Existing users, indexed by their 'email' field.
 
     Returns:
         bool: True if the email is valid and unused, False otherwise.
     """
-    if not re.fullmatch(r'[^@ \t\r\n]+@[^@ \t\r\n]+\.[^@ \t\r\n]+', email):
+    if not _EMAIL_RE.fullmatch(email):
         encased_print('Invalid email format. Please try again.')
         return False
-    elif email in [user['email'] for user in users]:
+    elif email in users_by_email:
         encased_print(f'A user with the e-mail address "{email}" already exists! Please try again.')
         return False
     return True
@@ -249,12 +523,33 @@ def is_valid_phone_number(phone_number: str) -> bool:
     Returns:
         bool: True if the phone number is valid, False otherwise.
     """
-    if not re.fullmatch(r'^\+\d{8,15}$', phone_number):
+    if not _PHONE_RE.fullmatch(phone_number):
         encased_print('Invalid phone number format. Please try again.')
         return False
     return True
 
 
+def parse_finite_float(text: str) -> float:
+    """
+    Converts user input to a float, rejecting infinite and NaN values.
+
+    `float()` accepts inputs like "inf" and "nan", which cannot be stored as regular JSON numbers.
+
+    Parameters:
+        text (str): The user input to convert.
+
+    Returns:
+        float: The converted number.
+
+    Raises:
+        ValueError: If the input is not a number or not finite.
+    """
+    value = float(text)
+    if not math.isfinite(value):
+        raise ValueError(f'{text!r} is not a finite number')
+    return value
+
+
 def validate_date(date_input: str) -> Optional[str]:
     """
     Validates and reformats a user-provided date string.
@@ -269,18 +564,23 @@ def validate_date(date_input: str) -> Optional[str]:
         Optional[str]: Reformatted date string in "YYYY/MM/DD" format
                        if valid, otherwise None.
     """
-    allowed_formats = {"%m-%d-%Y", "%m/%d/%Y"}
-    saving_format = '%Y/%m/%d'
-    for format_ in allowed_formats: 
+    match = _DATE_RE.fullmatch(date_input)
+    if match:
+        month, _, day, year = match.groups()
+        month, day, year = int(month), int(day), int(year)
         try: 
-            date = datetime.strptime(date_input, format_).strftime(saving_format) # correctly formatted date string
-            return date
+            datetime(year, month, day) # only checks that the date exists
+            return f'{year:04d}/{month:02d}/{day:02d}'
         except ValueError:
             pass
     encased_print('Invalid date format. Provide in either "MM/DD/YYYY" or "MM-DD-YYYY".', 'Please try again.')
     
     
-def register(users: List[Dict[str, Any]]) -> None:
+def register(
+    users: List[Dict[str, Any]],
+    users_by_username: Dict[str, Dict[str, Any]],
+    users_by_email: Dict[str, Dict[str, Any]]
+) -> None:
     """
     Interactively collect and validate user input to register a new user.
 
@@ -290,6 +590,8 @@ def register(users: List[Dict[str, Any]]) -> None:
 
     Parameters:
         users (List[Dict[str, Any]]): The user data.
+        users_by_username (Dict[str, Dict[str, Any]]): The user data, indexed by username.
+        users_by_email (Dict[str, Dict[str, Any]]): The user data, indexed by email.
 
     Returns:
         List[Dict[str, Any]]: Updated user data including the new user.
@@ -298,7 +600,7 @@ def register(users: List[Dict[str, Any]]) -> None:
     print('Register new user')
     while True:
         username = input('Please enter your desired username: ').strip()
-        if is_valid_new_username(username, users):
+        if is_valid_new_username(username, users_by_username):
             break
     while True:
         password = input('Please enter your Password: ').strip()
@@ -308,7 +610,7 @@ def register(users: List[Dict[str, Any]]) -> None:
                 break
     while True:
         email = input('Please enter your E-Mail address: ').strip()
-        if is_valid_email(email, users):
+        if is_valid_email(email, users_by_email):
             break
     while True:
         phone_number = input('Please enter your phone number in this format: +491234567890 : ').strip()
@@ -316,7 +618,7 @@ def register(users: List[Dict[str, Any]]) -> None:
             break
     while True:
         try:
-            spending_limit = float(input('Please enter a spending limit in €. You can change it later. : ').strip())
+            spending_limit = parse_finite_float(input('Please enter a spending limit in €. You can change it later. : ').strip())
             if not spending_limit:
                 spending_limit = 0
             break
@@ -329,21 +631,30 @@ def register(users: List[Dict[str, Any]]) -> None:
     new_user['phone'] = phone_number
     new_user['purchases'] = []
     new_user['spending_limit'] = spending_limit
-    add_user(new_user, users)
+    add_user(new_user, users, users_by_username, users_by_email)
     
 
-def add_user(new_user: Dict[str, Any], users: List[Dict[str, Any]]) -> None:
+def add_user(
+    new_user: Dict[str, Any],
+    users: List[Dict[str, Any]],
+    users_by_username: Dict[str, Dict[str, Any]],
+    users_by_email: Dict[str, Dict[str, Any]]
+) -> None:
     """
-    Adds a new user to the list of users and persists the updated data to disk.
+    Adds a new user to the list of users and its indexes and persists the updated data to disk.
 
-    Delegates the actual saving to `save_user_data`.
+    Delegates the actual saving to `save_single_user`.
 
     Parameters:
         new_user (Dict[str, Any]): The user data to append.
         users (List[Dict[str, Any]]): The list of all existing users.
+        users_by_username (Dict[str, Dict[str, Any]]): Index of all existing users by username.
+        users_by_email (Dict[str, Dict[str, Any]]): Index of all existing users by email.
     """
     users.append(new_user)
-    save_user_data(users)
+    users_by_username[new_user['username']] = new_user
+    users_by_email[new_user['email']] = new_user
+    save_single_user(new_user)
     encased_print(f'Successfully registered new user {new_user['username']}!')
 
 
@@ -353,6 +664,7 @@ def is_correct_password(user_data: Dict[str, Any]) -> bool:
 
     Compares the input with the stored password in user_data.
     Returns after first match or after three failed attempts.
+    The wait before each retry grows quadratically with the number of failed attempts (1s, 4s).
 
     Parameters:
         user_data (Dict[str, Any]): The data of the user in the original user data.
@@ -365,21 +677,23 @@ def is_correct_password(user_data: Dict[str, Any]) -> bool:
         password = input('Please enter your password: ').strip()
         if user_data['password'] == password:
             return True
-        print('Wait 5 seconds to retry')
-        time.sleep(5)
-    exit_program('Too many unsuccessful login attempts')
+        if i < MAX_PASSWORD_ATTEMPTS - 1:
+            delay = (i + 1) ** 2
+            print(f'Wait {delay} second{'s' if delay > 1 else ''} to retry')
+            time.sleep(delay)
+    exit_program(reason='Too many unsuccessful login attempts')
 
 
-def login(users: List[Dict[str, Any]]) -> bool:
+def login(users_by_username: Dict[str, Dict[str, Any]]) -> bool:
     """
     Authenticate a user by username and password.
 
-    Prompts for username and checks if it exists in the given user list.
+    Prompts for username and looks it up in the given username index.
     If found, prompts for the password with up to three attempts.
     Prints login result.
 
     Parameters:
-        users (List[Dict[str, Any]]): List of user dictionaries with at least 'username' and 'password' keys.
+        users_by_username (Dict[str, Dict[str, Any]]): User dictionaries with at least a 'password' key, indexed by username.
 
     Returns:
         bool: True if login is successful, False otherwise.
@@ -388,12 +702,8 @@ def login(users: List[Dict[str, Any]]) -> bool:
     if is_logged_in:
         encased_print('You\'re already logged in')
         return False
-    user_data = None
     username = input('Please enter your username: ').strip()
-    for user in users:
-        if user['username'] == username:
-            user_data = user
-            break
+    user_data = users_by_username.get(username)
     if user_data:
         if is_correct_password(user_data):
             current_user = user_data
@@ -406,35 +716,71 @@ def login(users: List[Dict[str, Any]]) -> bool:
     return False
 
   
+def purchase_key(purchase: Dict[str, Any]) -> Tuple[Any, ...]:
+    """
+    Returns a hashable key identifying a purchase by all of its fields.
+
+    Parameters:
+        purchase (Dict[str, Any]): The purchase record.
+
+    Returns:
+        Tuple[Any, ...]: The purchase's field values in a fixed order.
+    """
+    return (
+        purchase['date'], purchase['seller'], purchase['item_name'], purchase['cost'],
+        purchase['quantity'], purchase['total_weight'], purchase['total_cost']
+    )
+
+
+def get_user_purchase_keys(user: Dict[str, Any]) -> Set[Tuple[Any, ...]]:
+    """
+    Returns the cached set of purchase keys of a user, building it on first use.
+
+    Parameters:
+        user (Dict[str, Any]): The user whose purchases should be indexed.
+
+    Returns:
+        Set[Tuple[Any, ...]]: The keys of all purchases of the user.
+    """
+    keys = _user_purchase_keys.get(user['username'])
+    if keys is None:
+        keys = _user_purchase_keys[user['username']] = {purchase_key(purchase) for purchase in user['purchases']}
+    return keys
+
+
 @requires_login   
-def save_purchase(purchase_data: Dict[str, Any], users: List[Dict[str, Any]]) -> bool:
+def save_purchase(purchase_data: Dict[str, Any]) -> bool:
     """
     Saves a validated purchase entry to the current user's purchase history and 
-    calls the save_user_data function to write the updated data to disk.
+    appends it to the purchase log on disk.
+
+    If the purchase cannot be appended to the log, the user's data file is rewritten instead.
+    If that fails as well, the purchase is removed from the history again.
 
     Parameters:
         purchase_data (Dict[str, Any]): The purchase information to store.
-        users (List[Dict[str, Any]]): The list of all user records to be updated and written to file.
 
     Returns:
-        bool: True if the purchase is saved and data written successfully.
+        bool: True if the purchase is saved and data written successfully, False otherwise.
     """
     current_user['purchases'].append(purchase_data)
-    save_user_data(users)
+    if not append_purchase_log(current_user['username'], purchase_data):
+        if not save_single_user(current_user, quiet=True):
+            current_user['purchases'].pop()
+            encased_print(f'The purchase from {purchase_data['date']} could not be saved!')
+            return False
+    get_user_purchase_keys(current_user).add(purchase_key(purchase_data))
     encased_print(f'Saved purchase from {purchase_data['date']} successfully!')
     return True
 
 
 @requires_login
-def enter_purchase(users: List[Dict[str, Any]]) -> None:
+def enter_purchase() -> None:
     """
     Interactive input loop to collect and validate purchase data from the user.
 
     On successful validation, displays a purchase summary and prompts the user to confirm saving.
     If confirmed, passes the data to `save_purchase`.
-
-    Parameters:
-        users (List[Dict[str, Any]]): The list of all user records used for saving the updated purchase.
     """
     while True:
         while True:
@@ -454,19 +800,19 @@ def enter_purchase(users: List[Dict[str, Any]]) -> None:
             encased_print('Item name should be at least 3 characters. Please try again.')
         while True:
             try:
-                cost = float(input('How much did it one unit cost? (in EUR): ').strip())
+                cost = parse_finite_float(input('How much did it one unit cost? (in EUR): ').strip())
                 break
             except ValueError:
                 encased_print('Not a valid number!\nPlease try again')
         while True:
             try:
-                delivery_fee = float(input('How much was the delivery fee? (in EUR): ').strip())
+                delivery_fee = parse_finite_float(input('How much was the delivery fee? (in EUR): ').strip())
                 break
             except ValueError:
                 encased_print('Not a valid number! (example: 2.4)\nPlease try again')
         while True:
             try:
-                weight = float(input('How much does one unit weigh? (in kg): ').strip())
+                weight = parse_finite_float(input('How much does one unit weigh? (in kg): ').strip())
                 break
             except ValueError:
                 encased_print('Not a valid number!\nPlease try again')
@@ -478,6 +824,9 @@ def enter_purchase(users: List[Dict[str, Any]]) -> None:
                 encased_print('Not a valid number!\nPlease try again')
         total_weight = quantity * weight
         total_cost = quantity * cost + delivery_fee
+        if not (math.isfinite(total_weight) and math.isfinite(total_cost)):
+            encased_print('The totals of this purchase are too large!\nPlease try again')
+            continue
         purchase_data = {
             'date': date,
             'seller': seller,
@@ -487,7 +836,7 @@ def enter_purchase(users: List[Dict[str, Any]]) -> None:
             'total_weight': total_weight,
             'total_cost': total_cost
         }
-        if purchase_data in current_user['purchases']:
+        if purchase_key(purchase_data) in get_user_purchase_keys(current_user):
             encased_print('This purchase data already exists!')
             break
         encased_print(
@@ -496,12 +845,39 @@ def enter_purchase(users: List[Dict[str, Any]]) -> None:
             f'Are you sure, you want to save this purchase?'
             )
         user_confirmation = [
-                (save_purchase, 'save data', (purchase_data, users), {}),
+                (save_purchase, 'save data', (purchase_data, ), {}),
                 (lambda: False, 'enter data again', (), {}),
             ]
         if menu(user_confirmation):
             break
 
+def summarize_purchases(purchases: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, Any], float, float, int]:
+    """
+    Aggregates a non-empty list of purchases in a single pass.
+
+    Parameters:
+        purchases (List[Dict[str, Any]]): The purchase records to aggregate.
+
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, Any], float, float, int]: The priciest purchase, the heaviest purchase,
+            the total spending, the total weight and the total quantity.
+    """
+    priciest_purchase = heaviest_purchase = purchases[0]
+    total_spending = total_weight = 0.0
+    total_quantity = 0
+    for purchase in purchases:
+        purchase_cost = purchase['total_cost']
+        purchase_weight = purchase['total_weight']
+        total_spending += purchase_cost
+        total_weight += purchase_weight
+        total_quantity += purchase['quantity']
+        if purchase_cost > priciest_purchase['total_cost']:
+            priciest_purchase = purchase
+        if purchase_weight > heaviest_purchase['total_weight']:
+            heaviest_purchase = purchase
+    return priciest_purchase, heaviest_purchase, total_spending, total_weight, total_quantity
+
+
 @encase_output()
 @requires_login   
 def generate_full_report(purchases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -516,11 +892,7 @@ def generate_full_report(purchases: List[Dict[str, Any]]) -> List[Dict[str, Any]
     Returns:
         purchases (List[Dict[str, Any]]): A List of all purchases done by the user.
     """
-    priciest_purchase = max(purchases, key=lambda purchase: purchase["total_cost"])
-    heaviest_purchase = max(purchases, key=lambda purchase: purchase["total_weight"])
-    total_spending = sum(purchase['total_cost'] for purchase in purchases)
-    total_weight = sum(purchase['total_weight'] for purchase in purchases)
-    total_quantity = sum(purchase['quantity'] for purchase in purchases)
+    priciest_purchase, heaviest_purchase, total_spending, total_weight, total_quantity = summarize_purchases(purchases)
     total_purchases = len(purchases)
     print('Here is a summary of your previous purchases:\n')
     print(f'You bought {total_quantity} items for a total of: {total_spending:.2f}€.')
@@ -562,7 +934,7 @@ def generate_filtered_report(purchases: List[Dict[str, Any]], filter_key: str) -
     Returns:
         purchases (List[Dict[str, Any]]): A List of all purchases done by the user, matching the filter.
     """
-    if filter_key not in set(purchases[0].keys()):
+    if filter_key not in _PURCHASE_KEYS:
         print('Invalid filter key!')
         return
     while True:
@@ -575,11 +947,7 @@ def generate_filtered_report(purchases: List[Dict[str, Any]], filter_key: str) -
     if not filtered_purchases:
         print(f"No purchases found matching filter: {filter_key} = {filter_key_value.capitalize()}")
         return
-    priciest_purchase = max(filtered_purchases, key=lambda purchase: purchase["total_cost"])
-    heaviest_purchase = max(filtered_purchases, key=lambda purchase: purchase["total_weight"])
-    total_spending = sum(purchase['total_cost'] for purchase in filtered_purchases)
-    total_weight = sum(purchase['total_weight'] for purchase in filtered_purchases)
-    total_quantity = sum(purchase['quantity'] for purchase in filtered_purchases)
+    priciest_purchase, heaviest_purchase, total_spending, total_weight, total_quantity = summarize_purchases(filtered_purchases)
     total_purchases = len(filtered_purchases)
     print(f'Here is a summary of your previous purchases, filtered for {filter_key} = {filter_key_value}:\n')
     print(f'You bought {total_quantity} items for a total of: {total_spending:.2f}€.')
@@ -646,10 +1014,10 @@ def generate_report(report_type: str = '') -> None:
             (lambda: None, 'end the report', (), {})
         ]
         purchase_list = menu(user_decision)
-        # if len(purchase_list) is 5, max_digits will be 1 (for for len(4))
-        # if len(purchase_list) is 15, max_digits will be 2 (for len(14))
-        max_digits = len(str(len(purchase_list) - 1))
         if purchase_list:
+            # if len(purchase_list) is 5, max_digits will be 1 (for for len(4))
+            # if len(purchase_list) is 15, max_digits will be 2 (for len(14))
+            max_digits = len(str(len(purchase_list) - 1))
             for i, purchase in enumerate(purchase_list):
                 print(f'[{i:0{max_digits}}] {purchase}')
                 
@@ -659,44 +1027,50 @@ def generate_report(report_type: str = '') -> None:
             
       
 @requires_login 
-def set_spending_limit(users: List[Dict[str, Any]]) -> None:
+def set_spending_limit() -> None:
     while True:
         try:
-            limit = float(input('What do you want your limit to be?: ').strip())
+            limit = parse_finite_float(input('What do you want your limit to be?: ').strip())
             break
         except ValueError:
             encased_print('Please enter a valid number! Please try again.')
     current_user['spending_limit'] = limit
-    save_user_data(users)
+    save_single_user(current_user)
     print(f'Spending limit set to {limit:.2f}€.')
     
 
 def main():
-    users = load_user_data()
+    user_data = load_user_data()
+    if user_data is None:
+        exit_program(reason=f'The user data could not be loaded from "{USER_DATA_PATH}".')
+    users, users_by_username, users_by_email = user_data
     print('-'*40)
     print(f'|   Welcome to the {APP_NAME}!   |')
     print('-'*40)
-    # loop for the main menu
-    while True:
-        user_control_actions = [
-            (login, 'login', (users,), {}),
-            (register, 'register', (users,), {})
-        ]
-        user_spending_actions = [
-            (enter_purchase, 'enter a new purchase', (users, ), {}),
-            (generate_report, 'generate a report of your current spending', (), {}),
-            (set_spending_limit, 'set a custom spending limit', (users, ), {})
-        ]
-        top_level_menu_options = [
-                (menu, 'login / register', (user_control_actions,), {}),
-                (menu, 'manage your purchases', (user_spending_actions,), {})
+    # loop for the main menu, the purchase log is folded into the user data on exit
+    try:
+        while True:
+            user_control_actions = [
+                (login, 'login', (users_by_username,), {}),
+                (register, 'register', (users, users_by_username, users_by_email), {})
             ]
-        if is_logged_in:
-            top_level_menu_options = [
-                (menu, 'manage your purchases', (user_spending_actions,), {})
+            user_spending_actions = [
+                (enter_purchase, 'enter a new purchase', (), {}),
+                (generate_report, 'generate a report of your current spending', (), {}),
+                (set_spending_limit, 'set a custom spending limit', (), {})
             ]
-        menu(top_level_menu_options)
-        
+            top_level_menu_options = [
+                    (menu, 'login / register', (user_control_actions,), {}),
+                    (menu, 'manage your purchases', (user_spending_actions,), {})
+                ]
+            if is_logged_in:
+                top_level_menu_options = [
+                    (menu, 'manage your purchases', (user_spending_actions,), {})
+                ]
+            menu(top_level_menu_options)
+    finally:
+        compact(users_by_username)
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file